@@ -0,0 +1,615 @@
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+import click
+import pathspec
+from git import Repo
+from git.exc import GitError, GitCommandError
+from pathlib import Path
+import hashlib
+import json
+import os
+import re
+import shutil
+from typing import BinaryIO, List, Optional, Union
+from rich.progress import (
+    BarColumn,
+    MofNCompleteColumn,
+    Progress,
+    TextColumn,
+    TimeElapsedColumn,
+)
+
+
+CACHE_DIR = Path.home() / '.cache' / 'sewsource'
+SCAN_WORKERS = 16
+CONCAT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+WRITE_BUFFER_SIZE = 1 << 20
+# signatures of written outputs live with the cache, not in the deliverable
+MANIFEST_DIR = CACHE_DIR / 'manifests'
+LEGACY_MANIFEST_NAME = '.sewsource-manifest.json'
+# bump whenever the output format changes, so older outputs get rebuilt
+MANIFEST_FORMAT = 'sewsource-output-v1'
+# only the latest snapshot is read, so skip the history, tags and other branches
+CLONE_OPTIONS = ['--depth=1', '--filter=blob:none', '--single-branch', '--no-tags']
+GITHUB_URL_PATTERN = re.compile(r'^https?://github\.com/[\w-]+/[\w-][\w.-]*$')
+
+
+def is_valid_github_url(url: str) -> bool:
+    """
+    Validate if the provided URL is a valid GitHub repository URL.
+    Args:
+        url (str): GitHub URL to validate
+    Returns:
+        bool: True if valid, False otherwise
+    """
+    return GITHUB_URL_PATTERN.match(url) is not None
+
+
+def get_repository_error_message(error_output: str) -> str:
+    """
+    Determine if repository is private or doesn't exist based on git error message.
+    Args:
+        error_output (str): Git error message
+    Returns:
+        str: User-friendly error message
+    """
+    if (
+        'Authentication failed' in error_output
+        or 'could not read Username' in error_output
+    ):
+        return 'Repository is private. Please check the URL or your access permissions.'
+    elif (
+        'not found' in error_output.lower()
+        or 'repository not found' in error_output.lower()
+    ):
+        return 'Repository does not exist. Please check the URL.'
+    else:
+        return 'Repository is either private or does not exist.'
+
+
+def clone_repository(url: str, temp_dir: str) -> Path:
+    """
+    Clone a GitHub repository into a temporary directory.
+    Args:
+        url (str): GitHub repository URL
+        temp_dir (str): Path to temporary directory
+    Returns:
+        Path: Path to the cloned repository
+    Raises:
+        GitCommandError: If cloning fails
+        ValueError: If URL is invalid
+    """
+    if not is_valid_github_url(url):
+        raise ValueError(
+            'Invalid GitHub URL format. Expected format: https://github.com/username/repository'
+        )
+
+    repo_path = Path(temp_dir) / url.split('/')[-1].replace('.git', '')
+
+    try:
+        Repo.clone_from(url, repo_path, multi_options=CLONE_OPTIONS)
+        return repo_path
+    except GitCommandError as e:
+        error_message = get_repository_error_message(str(e))
+        raise GitError(error_message)
+
+
+def fetch_cached_repository(url: str, cache_dir: Path) -> Path:
+    """
+    Clone a GitHub repository into a persistent cache, or refresh the cached copy.
+    Args:
+        url (str): GitHub repository URL
+        cache_dir (Path): Path to the cache directory
+    Returns:
+        Path: Path to the cached repository
+    Raises:
+        GitError: If cloning or refreshing fails
+        ValueError: If URL is invalid
+    """
+    if not is_valid_github_url(url):
+        raise ValueError(
+            'Invalid GitHub URL format. Expected format: https://github.com/username/repository'
+        )
+
+    cache_root = Path(cache_dir) / hashlib.sha1(url.encode('utf-8')).hexdigest()
+    repo_path = cache_root / url.split('/')[-1].replace('.git', '')
+
+    if repo_path.is_dir():
+        try:
+            repo = Repo(repo_path)
+            # ask for the remote's HEAD, the default branch may have moved on
+            # since the single-branch clone
+            repo.git.fetch('origin', 'HEAD', '--depth=1')
+            repo.git.reset('--hard', 'FETCH_HEAD')
+            return repo_path
+        except GitError:
+            # can't refresh the cached copy, start over and let the clone report
+            shutil.rmtree(repo_path)
+
+    cache_root.mkdir(parents=True, exist_ok=True)
+    return clone_repository(url, str(cache_root))
+
+
+def load_ignore_spec(
+    root_path: Path,
+    use_gitignore: bool = False,
+    ignore_files: tuple[str, ...] = (),
+) -> Optional[pathspec.PathSpec]:
+    """
+    Load gitignore-style patterns to prune the walk with.
+    Args:
+        root_path (Path): Path to the repository
+        use_gitignore (bool): Also honor the repository's own root .gitignore
+        ignore_files (tuple[str, ...]): Paths to user-supplied ignore files, whose
+            patterns are matched relative to the repository root
+    Returns:
+        Optional[PathSpec]: Compiled patterns, or None if there are none
+    Raises:
+        OSError: If a user-supplied ignore file can't be read
+    """
+    lines: List[str] = []
+
+    if use_gitignore:
+        try:
+            lines.extend(
+                (Path(root_path) / '.gitignore')
+                .read_text(encoding='utf-8')
+                .splitlines()
+            )
+        except (OSError, UnicodeDecodeError):
+            pass
+
+    for ignore_file in ignore_files:
+        lines.extend(Path(ignore_file).read_text(encoding='utf-8').splitlines())
+
+    if not lines:
+        return None
+
+    return pathspec.GitIgnoreSpec.from_lines(lines)
+
+
+def _scan_directory(
+    dir_path: str,
+    exclude_set: frozenset[str],
+    extension_suffixes: tuple[str, ...],
+    blacklist_set: frozenset[str],
+    ignore_spec: Optional[pathspec.PathSpec] = None,
+    root_prefix_len: int = 0,
+) -> tuple[List[str], List[str]]:
+    """
+    Scan a single directory for analyze_sources
+    returns the subdirectories worth walking into and the source files found
+    """
+    subdirs: List[str] = []
+    files: List[str] = []
+
+    try:
+        it = os.scandir(dir_path)
+    except OSError:
+        # unreadable or vanished directories are skipped, like rglob did
+        return subdirs, files
+
+    with it:
+        for entry in it:
+            # skip directories we hate, without ever walking into them
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in exclude_set and not (
+                    ignore_spec
+                    and ignore_spec.match_file(entry.path[root_prefix_len:] + '/')
+                ):
+                    subdirs.append(entry.path)
+                continue
+
+            name_lower = entry.name.lower()
+            if (
+                not name_lower.endswith(extension_suffixes)
+                or name_lower in blacklist_set
+            ):
+                continue
+
+            if ignore_spec and ignore_spec.match_file(entry.path[root_prefix_len:]):
+                continue
+
+            if entry.is_file():
+                files.append(entry.path)
+
+    return subdirs, files
+
+
+def analyze_sources(
+    root_path: Path,
+    include_dirs: tuple[str, ...] = (),
+    exclude_dirs: tuple[str, ...] = (),
+    blacklist: tuple[str, ...] = (),
+    extensions: tuple[str, ...] = (),
+    is_all: bool = False,
+    use_gitignore: bool = False,
+    ignore_files: tuple[str, ...] = (),
+) -> Union[dict[Path, List[Path]], List[Path]]:
+    """
+    analyze directory structure using os.scandir because rglob insisted on touring .git
+    returns a dictionary of folder paths and their source files
+
+    directories are scanned on a thread pool, scandir releases the GIL so the
+    syscalls overlap while the grouping stays on this thread
+
+    ignore files prune the walk, like ripgrep does, the repository's own .gitignore
+    only counts when asked for since a fresh clone has nothing untracked to skip
+
+    @param root_path: the path to your markdown wasteland
+    @return: a dict of folders and their files, organized like your life isn't
+    """
+    file_groups: dict[Path, List[Path]] = {}
+    exclude_set = frozenset(exclude_dirs)
+    # '-e md' means '.md', and must not turn into a match for run.cmd
+    extension_suffixes = tuple(
+        '.' + ext.lower().lstrip('.') for ext in extensions if ext.strip('.')
+    )
+    # a file named just '.md' has no suffix, so it's not a source either
+    blacklist_set = frozenset(name.lower() for name in blacklist).union(
+        extension_suffixes
+    )
+    ignore_spec = load_ignore_spec(root_path, use_gitignore, ignore_files)
+    # keep root_path as given, concatenate_sources makes paths relative to it
+    root_str = str(root_path)
+    # patterns match paths relative to the root, slicing gets us there for free
+    root_prefix_len = len(root_str) + 1
+
+    if include_dirs:
+        # include directories we love, and don't even look anywhere else
+        inc_rels = {os.path.normpath(inc_dir.strip('/')) for inc_dir in include_dirs}
+        wanted = {
+            os.path.join(root_str, inc_rel)
+            for inc_rel in inc_rels
+            # nothing outside the repository, and the root itself isn't an include
+            if inc_rel != os.curdir
+            and inc_rel != os.pardir
+            and not inc_rel.startswith(os.pardir + os.sep)
+            and not os.path.isabs(inc_rel)
+        }
+        pending_dirs = []
+
+        for inc_path in sorted(wanted):
+            if (
+                os.path.isdir(inc_path)
+                # the directories we hate still win
+                and exclude_set.isdisjoint(inc_path[root_prefix_len:].split(os.sep))
+                # nested includes are already covered by their parent
+                and not any(inc_path.startswith(other + os.sep) for other in wanted)
+            ):
+                pending_dirs.append(inc_path)
+    else:
+        pending_dirs = [root_str]
+
+    with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as executor:
+        running: set[Future[tuple[List[str], List[str]]]] = set()
+
+        while pending_dirs or running:
+            # keep the queue of in-flight scans bounded
+            while pending_dirs and len(running) < SCAN_WORKERS * 2:
+                running.add(
+                    executor.submit(
+                        _scan_directory,
+                        pending_dirs.pop(),
+                        exclude_set,
+                        extension_suffixes,
+                        blacklist_set,
+                        ignore_spec,
+                        root_prefix_len,
+                    )
+                )
+
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                subdirs, files = future.result()
+                pending_dirs.extend(subdirs)
+
+                if files:
+                    # only the files we keep get to become a Path
+                    file_paths = [Path(file) for file in files]
+                    file_groups[file_paths[0].parent] = file_paths
+
+    if is_all:
+        return [file for files in file_groups.values() for file in files]
+
+    return file_groups
+
+
+def _read_source(source: Path, buffer: bytearray) -> memoryview:
+    """
+    Reads a whole source file into a reusable buffer through an unbuffered handle
+    the buffer only grows when a bigger file than any before it comes along
+    """
+    with open(source, 'rb', buffering=0) as src:
+        size = os.fstat(src.fileno()).st_size
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(src.fileno(), 0, size, os.POSIX_FADV_SEQUENTIAL)
+
+        if len(buffer) < size:
+            buffer.extend(bytes(size - len(buffer)))
+
+        view = memoryview(buffer)[:size]
+        read = 0
+        # reads can come up short, keep going until we have it all
+        while read < size:
+            count = src.readinto(view[read:])
+            if not count:
+                break
+            read += count
+
+        return view[:read]
+
+
+def _append_source(
+    out: BinaryIO,
+    idx: int,
+    source: Path,
+    display_path: Union[Path, str],
+    buffer: bytearray,
+) -> None:
+    """
+    Writes a source file, headed by its separator, into an open output file
+    bytes are copied as-is so nothing gets decoded just to be encoded again
+    """
+    content = _read_source(source, buffer)
+
+    out.write(
+        f"""
+\n\n{'=' * 80}
+Source File {idx}: {display_path}
+{'=' * 80}\n
+""".encode('utf-8')
+    )
+    out.write(content)
+    out.write(b'\n')
+
+
+def _sources_signature(output_file: Path, file_list: List[Path]) -> Optional[str]:
+    """
+    Fingerprints an output file by the path, mtime and size of every source in it
+    returns None when a source can't be stat'ed, so it simply gets rebuilt
+    """
+    digest = hashlib.sha1(f'{MANIFEST_FORMAT}\0{output_file}'.encode('utf-8'))
+
+    try:
+        for file_path in file_list:
+            stat = os.stat(file_path)
+            digest.update(
+                f'\0{file_path}\0{stat.st_mtime_ns}\0{stat.st_size}'.encode('utf-8')
+            )
+    except OSError:
+        return None
+
+    return digest.hexdigest()
+
+
+def _manifest_file(out_root: Path) -> Path:
+    """
+    Locates the manifest for an output folder, keyed by its absolute path
+    """
+    key = hashlib.sha1(str(Path(out_root).resolve()).encode('utf-8')).hexdigest()
+    return MANIFEST_DIR / f'{key}.json'
+
+
+def _load_manifest(manifest_file: Path) -> dict[str, str]:
+    """
+    Loads the signatures of the outputs written by the previous run
+    anything that isn't a mapping of names to signatures counts as no manifest
+    """
+    try:
+        manifest = json.loads(manifest_file.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(manifest, dict):
+        return {}
+
+    return {
+        name: signature
+        for name, signature in manifest.items()
+        if isinstance(name, str) and isinstance(signature, str)
+    }
+
+
+def _process_folder(
+    i: int,
+    dir_path: Path,
+    file_list: List[Path],
+    root_path: Path,
+    out_root: Path,
+    previous_signature: Optional[str] = None,
+) -> tuple[Optional[str], bool]:
+    """
+    Concatenates the files of a single folder into its numbered output file
+    returns the signature of the output and whether it had to be written,
+    the signature is None when any source failed so the output gets rebuilt
+    """
+    rel_dir = dir_path.relative_to(root_path)
+    output_file = out_root / f'{i}_{dir_path.name}.txt'
+
+    signature = _sources_signature(output_file, file_list)
+    if signature and signature == previous_signature and output_file.exists():
+        return signature, False
+
+    # one read buffer serves every file in the folder
+    buffer = bytearray()
+
+    with open(output_file, 'wb', buffering=WRITE_BUFFER_SIZE) as out:
+        out.write(
+            f"""
+{'#' * 50}
+# Folder: {rel_dir}
+# Number of files merged: {len(file_list)}
+{'#' * 50}\n
+""".encode('utf-8')
+        )
+
+        for idx, file_path in enumerate(file_list, 1):
+            # files sit right inside dir_path, so skip the full relative_to walk
+            rel_file = rel_dir / file_path.name
+
+            try:
+                _append_source(out, idx, file_path, rel_file, buffer)
+
+            except Exception as e:
+                signature = None
+                click.secho(
+                    f'\n❌ Failed to process {rel_file} - Error: {str(e)}',
+                    fg='red',
+                )
+
+    return signature, True
+
+
+def _process_repository(
+    file_list: List[Path],
+    root_path: Path,
+    out_root: Path,
+    previous_signature: Optional[str] = None,
+) -> tuple[Optional[str], bool]:
+    """
+    Concatenates every file of the repository into a single output file
+    returns the signature of the output and whether it had to be written,
+    the signature is None when any source failed so the output gets rebuilt
+    """
+    output_file = out_root / f'{root_path.name}.txt'
+
+    signature = _sources_signature(output_file, file_list)
+    if signature and signature == previous_signature and output_file.exists():
+        return signature, False
+
+    # one read buffer serves every file in the repository
+    buffer = bytearray()
+    # every file lives under root_path, so slicing beats relative_to
+    root_prefix_len = len(str(root_path)) + 1
+
+    # Stream everything into a single file
+    with open(output_file, 'wb', buffering=WRITE_BUFFER_SIZE) as out:
+        out.write(
+            f"""
+{'#' * 50}
+# Repository: {root_path.name}
+# Total files merged: {len(file_list)}
+{'#' * 50}\n
+""".encode('utf-8')
+        )
+
+        for idx, file_path in enumerate(file_list, 1):
+            rel_file = str(file_path)[root_prefix_len:]
+
+            try:
+                _append_source(out, idx, file_path, rel_file, buffer)
+
+            except Exception as e:
+                signature = None
+                click.secho(
+                    f'\n❌ Failed to process {rel_file} - Error: {str(e)}',
+                    fg='red',
+                )
+                continue
+
+    return signature, True
+
+
+def concatenate_sources(
+    file_groups: Union[dict[Path, List[Path]], List[Path]],
+    root_path: Path,
+    output_dir: Path,
+    is_all: bool,
+) -> None:
+    """
+    Concatenates files and export them to an output_dir
+    outputs whose sources haven't changed since the last run are left alone
+    """
+
+    out_root = Path(output_dir) / root_path.name
+    out_root.mkdir(parents=True, exist_ok=True)
+
+    manifest_file = _manifest_file(out_root)
+    manifest = _load_manifest(manifest_file)
+    # older versions kept the manifest among the outputs, don't ship it
+    (out_root / LEGACY_MANIFEST_NAME).unlink(missing_ok=True)
+    signatures: dict[str, str] = {}
+    skipped = 0
+
+    if isinstance(file_groups, dict):
+        total_folders = len(file_groups)
+        total_files = sum(len(files) for files in file_groups.values())
+
+        click.secho(
+            f'\n🚀 Found {total_files} files and {total_folders} folders to merge.',
+            fg='blue',
+        )
+    else:
+        total_files = len(file_groups)
+
+        click.secho(
+            f'\n🚀 Found {total_files} files and to merge into a `single source file`.',
+            fg='blue',
+        )
+
+    if is_all and isinstance(file_groups, list):
+        output_name = f'{root_path.name}.txt'
+
+        # sort so the output is the same from run to run
+        signature, written = _process_repository(
+            sorted(file_groups, key=str),
+            root_path,
+            out_root,
+            manifest.get(output_name),
+        )
+
+        if signature:
+            signatures[output_name] = signature
+        skipped += not written
+
+    if not is_all and isinstance(file_groups, dict):
+        # sort so the numbering is the same from run to run
+        groups = sorted(file_groups.items(), key=lambda item: str(item[0]))
+
+        with ThreadPoolExecutor(max_workers=CONCAT_WORKERS) as executor:
+            futures = {
+                executor.submit(
+                    _process_folder,
+                    i,
+                    dir_path,
+                    sorted(file_list, key=lambda file: file.name),
+                    root_path,
+                    out_root,
+                    manifest.get(f'{i}_{dir_path.name}.txt'),
+                ): f'{i}_{dir_path.name}.txt'
+                for i, (dir_path, file_list) in enumerate(groups, 1)
+            }
+
+            # rich throttles redraws itself, so advancing per folder stays cheap
+            with Progress(
+                TextColumn('[green]📁 Processing folders'),
+                BarColumn(complete_style='green'),
+                MofNCompleteColumn(),
+                TimeElapsedColumn(),
+                refresh_per_second=10,
+            ) as progress:
+                task = progress.add_task('folders', total=len(futures))
+
+                for future in as_completed(futures):
+                    signature, written = future.result()
+
+                    if signature:
+                        signatures[futures[future]] = signature
+                    skipped += not written
+                    progress.advance(task)
+
+    manifest_file.parent.mkdir(parents=True, exist_ok=True)
+    manifest_file.write_text(json.dumps(signatures, indent=2), encoding='utf-8')
+
+    if skipped:
+        click.secho(
+            f'\n♻️  {skipped} output(s) unchanged since the last run, left as they were.',
+            fg='blue',
+        )